@@ -15,6 +15,7 @@ import sys
 from pathlib import Path
 from typing import Any, Sequence
 import qrcode
+from PIL import Image
 from datetime import datetime
 
 # MCP imports
@@ -83,6 +84,11 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "boolean", 
                         "description": "Also display QR code in chat interface",
                         "default": True
+                    },
+                    "verify": {
+                        "type": "boolean",
+                        "description": "Check the saved PNG against the generated module matrix",
+                        "default": False
                     }
                 },
                 "required": ["content"]
@@ -123,6 +129,11 @@ async def handle_list_tools() -> list[types.Tool]:
                         "minimum": 1,
                         "maximum": 20,
                         "default": 5
+                    },
+                    "verify": {
+                        "type": "boolean",
+                        "description": "Check each saved PNG against its generated module matrix",
+                        "default": False
                     }
                 },
                 "required": ["qr_codes"]
@@ -141,6 +152,25 @@ async def handle_list_tools() -> list[types.Tool]:
                     }
                 }
             }
+        ),
+        types.Tool(
+            name="verify_qrcodes",
+            description="Verify that saved QR code PNG files match the content recorded in their metadata sidecar files",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "directory": {
+                        "type": "string",
+                        "description": "Directory containing QR code PNG and metadata files",
+                        "default": "./qr_output/"
+                    },
+                    "update_metadata": {
+                        "type": "boolean",
+                        "description": "Record the verification result in each metadata file",
+                        "default": True
+                    }
+                }
+            }
         )
     ]
 
@@ -183,7 +213,91 @@ def generate_filename(content: str, custom_filename: str = "", file_id: str = ""
     
     return f"qr_{timestamp}_{content_preview}"
 
-def save_metadata(filepath: str, content: str, parameters: dict) -> str:
+def verify_qr_code_image(filepath: str, qr: qrcode.QRCode, box_size: int) -> dict:
+    """Verify a saved PNG by sampling each module and comparing it to the QR matrix"""
+    
+    # The matrix includes the quiet zone, so the border is checked as well
+    matrix = qr.get_matrix()
+    expected_width = len(matrix) * box_size
+    
+    try:
+        with Image.open(filepath) as img:
+            if img.size != (expected_width, expected_width):
+                return {
+                    "verified": False,
+                    "verified_date": datetime.now().isoformat(),
+                    "error": f"Unexpected image size {img.size[0]}x{img.size[1]}, expected {expected_width}x{expected_width}"
+                }
+            
+            pixels = img.convert("L").load()
+            offset = box_size // 2
+            mismatched = 0
+            for row_index, row in enumerate(matrix):
+                y = row_index * box_size + offset
+                for col_index, dark in enumerate(row):
+                    if (pixels[col_index * box_size + offset, y] < 128) != dark:
+                        mismatched += 1
+    except Exception as e:
+        return {
+            "verified": False,
+            "verified_date": datetime.now().isoformat(),
+            "error": str(e)
+        }
+    
+    result = {
+        "verified": mismatched == 0,
+        "verified_date": datetime.now().isoformat(),
+        "modules_checked": len(matrix) ** 2
+    }
+    if mismatched:
+        result["modules_mismatched"] = mismatched
+    
+    return result
+
+def verify_qr_code_file(filepath: str, metadata_path: str, update_metadata: bool = True) -> dict:
+    """Rebuild a QR code from its metadata and verify the saved PNG against it"""
+    
+    try:
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        
+        if not metadata.get("content"):
+            raise ValueError("metadata missing content")
+        
+        parameters = metadata.get("parameters", {})
+        size = parameters.get("size", 5)
+        box_size = parameters.get("box_size", size * 2)
+        border = parameters.get("border", 4)
+        qr = create_qr_code_image(
+            metadata["content"],
+            parameters.get("error_correction", "M"),
+            box_size,
+            border
+        )
+    except Exception as e:
+        return {
+            "verified": False,
+            "verified_date": datetime.now().isoformat(),
+            "error": str(e)
+        }
+    
+    verification = verify_qr_code_image(filepath, qr, box_size)
+    
+    if update_metadata:
+        metadata["verification"] = verification
+        try:
+            with open(metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
+        except Exception as e:
+            return {
+                "verified": False,
+                "verified_date": verification["verified_date"],
+                "error": f"could not update metadata: {str(e)}"
+            }
+    
+    return verification
+
+def save_metadata(filepath: str, content: str, parameters: dict, verification: dict | None = None) -> str:
     """Save QR code metadata as JSON"""
     
     metadata = {
@@ -194,6 +308,9 @@ def save_metadata(filepath: str, content: str, parameters: dict) -> str:
         "file_size_bytes": os.path.getsize(filepath) if os.path.exists(filepath) else 0
     }
     
+    if verification is not None:
+        metadata["verification"] = verification
+    
     metadata_path = filepath.replace('.png', '_metadata.json')
     with open(metadata_path, 'w') as f:
         json.dump(metadata, f, indent=2)
@@ -210,6 +327,8 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
         return await handle_batch_generate_qrcodes(arguments or {})
     elif name == "list_generated_qrcodes":
         return await handle_list_generated_qrcodes(arguments or {})
+    elif name == "verify_qrcodes":
+        return await handle_verify_qrcodes(arguments or {})
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -224,6 +343,7 @@ async def handle_generate_and_save_qrcode(arguments: dict) -> list[types.TextCon
     border = arguments.get("border", 4)
     include_metadata = arguments.get("include_metadata", True)
     display_in_chat = arguments.get("display_in_chat", True)
+    verify = arguments.get("verify", False)
     
     if not content:
         return [types.TextContent(type="text", text="Error: Content cannot be empty")]
@@ -243,6 +363,11 @@ async def handle_generate_and_save_qrcode(arguments: dict) -> list[types.TextCon
         # Save PNG file
         img.save(filepath)
         
+        # Verify the saved file if requested
+        verification = None
+        if verify:
+            verification = verify_qr_code_image(filepath, qr, size * 2)
+        
         # Save metadata if requested
         metadata_path = ""
         if include_metadata:
@@ -252,7 +377,7 @@ async def handle_generate_and_save_qrcode(arguments: dict) -> list[types.TextCon
                 "border": border,
                 "box_size": size * 2
             }
-            metadata_path = save_metadata(filepath, content, parameters)
+            metadata_path = save_metadata(filepath, content, parameters, verification)
         
         # Create response
         response = []
@@ -272,6 +397,9 @@ async def handle_generate_and_save_qrcode(arguments: dict) -> list[types.TextCon
         if metadata_path:
             file_info += f"📋 **Metadata**: {metadata_path}\n"
         
+        if verification is not None:
+            file_info += f"🔍 **Verification**: {'✅ Passed' if verification['verified'] else '❌ Failed'}\n"
+        
         response.append(types.TextContent(type="text", text=file_info))
         
         # Display in chat if requested
@@ -306,6 +434,7 @@ async def handle_batch_generate_qrcodes(arguments: dict) -> list[types.TextConte
     output_directory = arguments.get("output_directory", "./qr_output/")
     error_correction = arguments.get("errorCorrectionLevel", "M")
     size = arguments.get("size", 5)
+    verify = arguments.get("verify", False)
     
     if not qr_codes:
         return [types.TextContent(type="text", text="Error: No QR codes specified")]
@@ -336,6 +465,11 @@ async def handle_batch_generate_qrcodes(arguments: dict) -> list[types.TextConte
             img = qr.make_image(fill_color="black", back_color="white")
             img.save(filepath)
             
+            # Verify against the matrix we already have in memory
+            verification = None
+            if verify:
+                verification = verify_qr_code_image(filepath, qr, size * 2)
+            
             # Save metadata
             parameters = {
                 "id": qr_id,
@@ -343,17 +477,27 @@ async def handle_batch_generate_qrcodes(arguments: dict) -> list[types.TextConte
                 "error_correction": error_correction,
                 "size": size
             }
-            metadata_path = save_metadata(filepath, content, parameters)
+            metadata_path = save_metadata(filepath, content, parameters, verification)
             
-            results.append(f"✅ Generated {qr_id}: {filename}.png")
-            generated_files.append({
+            file_entry = {
                 "id": qr_id,
                 "type": qr_type,
                 "filename": f"{filename}.png",
                 "filepath": filepath,
                 "metadata": metadata_path,
                 "size_bytes": os.path.getsize(filepath)
-            })
+            }
+            
+            if verification is None:
+                results.append(f"✅ Generated {qr_id}: {filename}.png")
+            elif verification["verified"]:
+                results.append(f"✅ Generated {qr_id}: {filename}.png (verified)")
+            else:
+                results.append(f"⚠️ Generated {qr_id}: {filename}.png (verification failed)")
+            
+            if verification is not None:
+                file_entry["verified"] = verification["verified"]
+            generated_files.append(file_entry)
             
         except Exception as e:
             results.append(f"❌ Failed {qr_id}: {str(e)}")
@@ -367,17 +511,22 @@ async def handle_batch_generate_qrcodes(arguments: dict) -> list[types.TextConte
         "files": generated_files
     }
     
+    if verify:
+        manifest["total_verified"] = sum(1 for f in generated_files if f.get("verified"))
+    
     manifest_path = os.path.join(output_directory, f"batch_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
     with open(manifest_path, 'w') as f:
         json.dump(manifest, f, indent=2)
     
+    verified_line = f"   - Verified: {manifest['total_verified']}\n" if verify else ""
+    
     summary = f"""🎯 **Batch QR Code Generation Complete**
 
 📊 **Summary**:
    - Requested: {len(qr_codes)}
    - Generated: {len(generated_files)}
    - Failed: {len(qr_codes) - len(generated_files)}
-
+{verified_line}
 📁 **Output Directory**: {output_directory}
 📋 **Batch Manifest**: {manifest_path}
 
@@ -446,6 +595,61 @@ async def handle_list_generated_qrcodes(arguments: dict) -> list[types.TextConte
     
     return [types.TextContent(type="text", text="\n".join(file_list))]
 
+async def handle_verify_qrcodes(arguments: dict) -> list[types.TextContent]:
+    """Verify saved QR code files against the content recorded in their metadata"""
+    
+    directory = arguments.get("directory", "./qr_output/")
+    update_metadata = arguments.get("update_metadata", True)
+    
+    if not os.path.exists(directory):
+        return [types.TextContent(type="text", text=f"❌ Directory not found: {directory}")]
+    
+    png_files = sorted(filename for filename in os.listdir(directory) if filename.endswith('.png'))
+    
+    if not png_files:
+        return [types.TextContent(type="text", text=f"📁 No PNG files found in {directory}")]
+    
+    results = []
+    passed = 0
+    failed = 0
+    skipped = 0
+    
+    pending = []
+    for png_file in png_files:
+        metadata_path = os.path.join(directory, png_file.replace('.png', '_metadata.json'))
+        if os.path.exists(metadata_path):
+            pending.append((os.path.join(directory, png_file), metadata_path))
+        else:
+            results.append(f"⏭️ Skipped {png_file}: No metadata")
+            skipped += 1
+    
+    for filepath, metadata_path in pending:
+        png_file = os.path.basename(filepath)
+        verification = verify_qr_code_file(filepath, metadata_path, update_metadata)
+        if verification["verified"]:
+            results.append(f"✅ Verified {png_file}")
+            passed += 1
+        else:
+            reason = verification.get("error") or f"{verification.get('modules_mismatched', 0)} modules mismatched"
+            results.append(f"❌ Failed {png_file}: {reason}")
+            failed += 1
+    
+    summary = f"""🔍 **QR Code Verification Complete**
+
+📊 **Summary**:
+   - Checked: {len(pending)}
+   - Passed: {passed}
+   - Failed: {failed}
+   - Skipped: {skipped}
+
+📁 **Directory**: {directory}
+
+**Results**:
+{chr(10).join(results)}
+"""
+    
+    return [types.TextContent(type="text", text=summary)]
+
 async def main():
     """Main server function"""
     # Run the server using stdin/stdout streams
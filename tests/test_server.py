@@ -4,8 +4,10 @@ Test Script for Enhanced QR Code MCP Server
 Demonstrates all functionality and validates the implementation
 """
 
+import asyncio
 import json
 import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -16,7 +18,12 @@ try:
     from enhanced_qrcode_server import (
         create_qr_code_image, 
         generate_filename, 
-        save_metadata
+        save_metadata,
+        verify_qr_code_image,
+        verify_qr_code_file,
+        handle_generate_and_save_qrcode,
+        handle_batch_generate_qrcodes,
+        handle_verify_qrcodes
     )
     import qrcode
 except ImportError as e:
@@ -97,6 +104,116 @@ def test_file_operations():
         print(f"❌ File operations test failed: {e}")
         return False
 
+def test_verification():
+    """Test verification of saved QR codes against their module matrix"""
+    print("🧪 Testing QR code verification...")
+    
+    test_dir = "./test_output"
+    Path(test_dir).mkdir(parents=True, exist_ok=True)
+    
+    try:
+        # Verify a freshly saved QR code
+        qr = create_qr_code_image("Test verification", "M", 10, 4)
+        img = qr.make_image(fill_color="black", back_color="white")
+        test_file = os.path.join(test_dir, "test_verify_qr.png")
+        img.save(test_file)
+        
+        verification = verify_qr_code_image(test_file, qr, 10)
+        assert verification["verified"], "Freshly saved QR code failed verification"
+        
+        # Verify from metadata and check the result is recorded
+        parameters = {"error_correction": "M", "size": 5, "border": 4, "box_size": 10}
+        metadata_path = save_metadata(test_file, "Test verification", parameters)
+        verification = verify_qr_code_file(test_file, metadata_path)
+        assert verification["verified"], "Verification from metadata failed"
+        
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        assert metadata["verification"]["verified"], "Verification result not recorded in metadata"
+        
+        # A QR code for different content must not verify
+        other_qr = create_qr_code_image("Different content", "M", 10, 4)
+        verification = verify_qr_code_image(test_file, other_qr, 10)
+        assert not verification["verified"], "Mismatched QR code passed verification"
+        
+        print("✅ Verification tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Verification test failed: {e}")
+        return False
+
+def test_verification_tools():
+    """Test the verify option on both generation tools and the verify_qrcodes tool"""
+    print("🧪 Testing verification tools...")
+    
+    test_dir = "./verify_test"
+    shutil.rmtree(test_dir, ignore_errors=True)
+    
+    try:
+        # Single generation with a custom filename
+        response = asyncio.run(handle_generate_and_save_qrcode({
+            "content": "Custom verified code",
+            "output_directory": test_dir,
+            "filename": "custom",
+            "display_in_chat": False,
+            "verify": True
+        }))
+        assert "✅ Passed" in response[0].text, "Single generation was not verified"
+        with open(os.path.join(test_dir, "custom_metadata.json"), 'r') as f:
+            metadata = json.load(f)
+        assert metadata["verification"]["verified"], "Single verification not recorded in metadata"
+        
+        # Batch generation records per-file results and the manifest total
+        response = asyncio.run(handle_batch_generate_qrcodes({
+            "qr_codes": [
+                {"id": "a", "content": "code-a"},
+                {"id": "b", "content": "code-b"}
+            ],
+            "output_directory": test_dir,
+            "verify": True
+        }))
+        assert "Verified: 2" in response[0].text, "Batch summary missing verified count"
+        manifest_file = next(f for f in os.listdir(test_dir) if f.startswith("batch_manifest_"))
+        with open(os.path.join(test_dir, manifest_file), 'r') as f:
+            manifest = json.load(f)
+        assert manifest["total_verified"] == 2, "Manifest total_verified mismatch"
+        assert all(entry["verified"] for entry in manifest["files"]), "Manifest entries not verified"
+        
+        # Tamper with one PNG by replacing it with a different code of the same size
+        shutil.copyfile(os.path.join(test_dir, "qr_b.png"), os.path.join(test_dir, "qr_a.png"))
+        
+        # Metadata without content must be reported, not blamed on the PNG
+        shutil.copyfile(os.path.join(test_dir, "qr_b.png"), os.path.join(test_dir, "broken.png"))
+        with open(os.path.join(test_dir, "broken_metadata.json"), 'w') as f:
+            json.dump({"parameters": {"error_correction": "M", "size": 5}}, f)
+        
+        # A PNG without metadata is skipped
+        shutil.copyfile(os.path.join(test_dir, "qr_b.png"), os.path.join(test_dir, "orphan.png"))
+        
+        # Runs the handler directly, not through the stdio server
+        text = asyncio.run(handle_verify_qrcodes({"directory": test_dir}))[0].text
+        
+        assert "Checked: 4" in text, "Not every PNG with metadata was checked"
+        assert "Passed: 2" in text, "Expected custom.png and qr_b.png to pass"
+        assert "Failed: 2" in text, "Expected qr_a.png and broken.png to fail"
+        assert "Skipped: 1" in text, "Expected orphan.png to be skipped"
+        assert "✅ Verified custom.png" in text, "Custom-named file was not verified"
+        assert "❌ Failed qr_a.png" in text and "modules mismatched" in text, "Tampered PNG not detected"
+        assert "❌ Failed broken.png: metadata missing content" in text, "Corrupt metadata not reported"
+        assert "⏭️ Skipped orphan.png: No metadata" in text, "Orphan PNG not listed as skipped"
+        
+        with open(os.path.join(test_dir, "qr_a_metadata.json"), 'r') as f:
+            metadata = json.load(f)
+        assert not metadata["verification"]["verified"], "Tampered result not recorded in metadata"
+        
+        print("✅ Verification tool tests passed")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Verification tool test failed: {e}")
+        return False
+
 def test_integration_example():
     """Create a complete integration example"""
     print("🧪 Testing complete integration example...")
@@ -176,6 +293,8 @@ def run_all_tests():
         test_qr_generation,
         test_filename_generation,
         test_file_operations,
+        test_verification,
+        test_verification_tools,
         test_integration_example
     ]
     